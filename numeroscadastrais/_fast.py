@@ -0,0 +1,178 @@
+"""Rotinas numéricas para validação de CPFs em grande volume.
+
+Usado por cpf.is_valid_batch. Com Numba instalado, os laços abaixo são
+compilados na primeira chamada; sem Numba, rodam como Python puro.
+
+    validate_bytes(buf, allow) - valida um CPF em bytes ASCII (ou um array
+                                 uint8 de códigos ASCII), com pontuação.
+    validate_joined(buf, offsets, allow) - o mesmo para vários CPFs
+                                 concatenados em um array uint8. Requer NumPy.
+    validate_rows_u8(rows) - valida as linhas de uma matriz uint8 (N, 9) ou
+                             (N, 11) só com digitos. Requer NumPy, não usa
+                             Numba.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+HAS_NUMBA = numba is not None
+
+
+def _jit(*signature):
+    """numba.njit com cache em disco, ou sem cache se não houver onde gravá-lo.
+    
+    Sem um diretório gravável para o cache (instalação somente leitura, sem
+    home), numba levanta RuntimeError já ao decorar a função.
+    """
+    def decorate(function):
+        try:
+            return numba.njit(*signature, cache=True, boundscheck=False)(
+                function
+            )
+        except RuntimeError:
+            return numba.njit(*signature, boundscheck=False)(function)
+    return decorate
+
+if numpy is not None:
+    # Pesos do primeiro digito verificador, criados uma única vez.
+    _WEIGHTS = numpy.arange(1, 10)
+
+
+def _calc_check_digits_u8(buf):
+    """Calcula os 2 digitos verificadores a partir dos 9 primeiros bytes."""
+    weighted = 0
+    plain = 0
+    for i in range(9):
+        # int() evita que a soma estoure quando buf é um array uint8.
+        digit = int(buf[i]) - 48
+        weighted += digit * (i + 1)
+        plain += digit
+
+    dv1 = (weighted % 11) % 10
+    dv2 = ((weighted - plain + 9 * dv1) % 11) % 10
+    return dv1, dv2
+
+def _is_specifically_invalid_u8(buf):
+    """Retorna se os 9 primeiros bytes são todos o mesmo digito."""
+    first = buf[0]
+    for i in range(1, 9):
+        if buf[i] != first:
+            return False
+    return True
+
+
+if HAS_NUMBA:
+    # Nada no pacote usa estas duas funções; sem assinatura nem cache, elas só
+    # são compiladas se alguém as chamar.
+    _calc_check_digits_u8 = numba.njit(boundscheck=False)(
+        _calc_check_digits_u8
+    )
+    _is_specifically_invalid_u8 = numba.njit(boundscheck=False)(
+        _is_specifically_invalid_u8
+    )
+
+
+def _validate_range(buf, start, end, allow_missing_check_digits):
+    """Mesmo que validate_bytes, para o trecho buf[start:end]."""
+    count = 0
+    weighted = 0
+    plain = 0
+    first = 0
+    repeated = True
+    dv_a = 0
+    dv_b = 0
+    for i in range(start, end):
+        # int() evita estouro quando buf é um array uint8.
+        c = int(buf[i])
+        # Espaços ASCII (os mesmos de str.isspace: \t\n\v\f\r, \x1c-\x1f e
+        # ' '), pontos e traços são ignorados.
+        if c == 32 or c == 46 or c == 45 or 9 <= c <= 13 or 28 <= c <= 31:
+            continue
+        if c < 48 or c > 57 or count == 11:
+            return -1
+        
+        digit = c - 48
+        if count == 0:
+            first = digit
+        elif count < 9 and digit != first:
+            repeated = False
+        
+        if count < 9:
+            weighted += digit * (count + 1)
+            plain += digit
+        elif count == 9:
+            dv_a = digit
+        else:
+            dv_b = digit
+        count += 1
+    
+    if count != 11 and not (count == 9 and allow_missing_check_digits):
+        return -1
+    if repeated:
+        return 0
+    if count == 9:
+        return 1
+    
+    dv1 = (weighted % 11) % 10
+    dv2 = ((weighted - plain + 9 * dv1) % 11) % 10
+    return 1 if dv_a == dv1 and dv_b == dv2 else 0
+
+def _validate_joined(buf, offsets, allow_missing_check_digits):
+    """Mesmo que validate_joined, com allow_missing_check_digits já bool."""
+    result = numpy.empty(len(offsets) - 1, dtype=numpy.bool_)
+    for i in range(len(offsets) - 1):
+        result[i] = _validate_range(
+            buf, offsets[i], offsets[i + 1], allow_missing_check_digits
+        ) == 1
+    return result
+
+
+if HAS_NUMBA:
+    _validate_range = _jit()(_validate_range)
+    _validate_joined = _jit()(_validate_joined)
+
+
+# Com Numba, valores como None ou 'yes' em allow_missing_check_digits resultam
+# em TypeError. As funções abaixo convertem o valor para bool, de modo que
+# aceitam o mesmo que cpf.is_valid com ou sem Numba.
+
+def validate_bytes(buf, allow_missing_check_digits):
+    """Remove símbolos e valida um CPF em bytes ASCII numa única passada.
+    
+    Mesmas regras de cpf.is_valid. Retorna 1 se o CPF é válido, 0 se o
+    número é inválido e -1 se o formato é inválido.
+    """
+    return _validate_range(
+        buf, 0, len(buf), bool(allow_missing_check_digits)
+    )
+
+def validate_joined(buf, offsets, allow_missing_check_digits):
+    """Valida vários CPFs concatenados em um único buffer.
+    
+    O i-ésimo CPF fica em buf[offsets[i]:offsets[i + 1]]. Retorna um
+    numpy.ndarray de bool.
+    """
+    return _validate_joined(buf, offsets, bool(allow_missing_check_digits))
+
+
+def validate_rows_u8(rows):
+    """Valida cada linha de uma matriz (N, 9) ou (N, 11) de códigos ASCII."""
+    digits = rows.astype(numpy.int64) - 48
+    head = digits[:, :9]
+    
+    weighted = head @ _WEIGHTS
+    plain = head.sum(axis=1)
+    dv1 = (weighted % 11) % 10
+    dv2 = ((weighted - plain + 9 * dv1) % 11) % 10
+    
+    result = ~(head == head[:, :1]).all(axis=1)
+    if rows.shape[1] == 11:
+        result &= (digits[:, 9] == dv1) & (digits[:, 10] == dv2)
+    return result
@@ -1,7 +1,28 @@
-import re
+import functools
+import weakref
 
 from .exceptions import *
 
+# Caractéres removidos por strip_symbols: espaços, pontos e traços.
+# _WHITESPACE tem todos os caractéres de str.isspace(), os mesmos de \s em re.
+_WHITESPACE = (
+    '\t\n\v\f\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+_STRIP_BYTES = b'\t\n\v\f\r\x1c\x1d\x1e\x1f .-'
+_STRIP_TABLE = str.maketrans('', '', _WHITESPACE + '.-')
+
+# Os 9 primeiros digitos de 000.000.000-00, 111.111.111-11, etc.
+_INVALID_PREFIXES = frozenset(d * 9 for d in '0123456789')
+
+# Instâncias compartilhadas por CPF.intern, indexadas por (classe, digitos).
+_CPF_POOL = weakref.WeakValueDictionary()
+
+# Módulo _fast, importado só por is_valid_batch: carregar NumPy e Numba (e
+# compilar as funções com Numba) leva centenas de milissegundos.
+_fast = None
+
 class CPF:
     """Cadastro de Pessoa Física.
     
@@ -46,12 +67,13 @@ class CPF:
     
     """
     
+    __slots__ = ('__valid', '__cpf_digits', '__regiao_fiscal', '__weakref__')
+    
     def __init__(self, cpf_string):
         """Cria um número de CPF a partir de uma string.
         
         Pontos, espaços e traços serão removidos da string antes dela ser
-        processada. Letras e outros caractéres não são removidos e resultam na
-        exceção InvalidCharacters.
+        processada. Letras e outros caractéres não são removidos.
         
         A string precisa ter 9 ou 11 digitos de comprimento. Caso tiver 9,
         os dois digitos verificadores serão calculados e adicionados a string,
@@ -59,22 +81,52 @@ class CPF:
         exceção criar um CPF com valor inválido. A validade do CPF pode ser
         verificada pela propriedade is_valid.
         
-        Strings com outros tamanhos resultam na exceção InvalidLength.
+        O comprimento é verificado antes dos caractéres. Strings com outros
+        tamanhos resultam na exceção InvalidLength, mesmo que contenham
+        letras. Strings no tamanho certo com letras ou outros caractéres
+        resultam na exceção InvalidCharacters.
         
         """
         cpf_digits = strip_symbols(cpf_string)
         require_format(cpf_digits, True)
         
-        if len(cpf_digits) == 11:
-            self.__valid = (
-                has_correct_check_digit(cpf_digits)
-                and not is_specifically_invalid_number(cpf_digits)
-            )
-        else:
-            cpf_digits += calc_check_digit(cpf_digits)
-            self.__valid = not is_specifically_invalid_number(cpf_digits)
-            
+        self.__set_digits(*_validate_digits(cpf_digits))
+    
+    def __set_digits(self, valid, cpf_digits):
+        """Preenche o CPF a partir de 11 digitos já validados."""
+        self.__valid = valid
         self.__cpf_digits = cpf_digits
+        # A décima região fiscal é identificada pelo digito zero.
+        self.__regiao_fiscal = int(cpf_digits[8]) or 10
+    
+    @classmethod
+    def intern(cls, cpf_string):
+        """Mesmo que CPF(cpf_string), mas reaproveita instâncias existentes.
+        
+        Enquanto houver alguma referência a um CPF criado por este método,
+        outras chamadas com o mesmo número retornam a mesma instância. Útil
+        para conjuntos de dados onde o mesmo CPF aparece muitas vezes.
+        
+        Cada subclasse tem suas próprias instâncias: Sub.intern(s) nunca
+        retorna um CPF criado por CPF.intern(s).
+        
+        """
+        cpf_digits = strip_symbols(cpf_string)
+        require_format(cpf_digits, True)
+        valid, cpf_digits = _validate_digits(cpf_digits)
+        
+        key = (cls, cpf_digits)
+        result = _CPF_POOL.get(key)
+        if result is None:
+            if cls.__init__ is CPF.__init__:
+                # A string já foi validada, não é preciso repetir o __init__.
+                result = cls.__new__(cls)
+                result.__set_digits(valid, cpf_digits)
+            else:
+                result = cls(cpf_digits)
+            _CPF_POOL[key] = result
+        
+        return result
     
     
     def equals_string(self, cps_string):
@@ -123,14 +175,7 @@ class CPF:
         o digito zero, que representa a décima região.
         
         """
-        
-        result = int(self.digito_regiao_fiscal) 
-        
-        # A décima região fiscal é identificada pelo digito zero.
-        if result == 0:
-            return 10
-        
-        return result
+        return self.__regiao_fiscal
     
     @property
     def digits_only(self):
@@ -158,11 +203,9 @@ class CPF:
         
         """
         
-        return (
-            self.digitos_aleatorios[0:3] +
-            '.' + self.digitos_aleatorios[3:6] +
-            '.' + self.digitos_aleatorios[6:8] + self.digito_regiao_fiscal +
-            '-' + self.digitos_verificadores
+        cpf_digits = self.__cpf_digits
+        return '%s.%s.%s-%s' % (
+            cpf_digits[0:3], cpf_digits[3:6], cpf_digits[6:9], cpf_digits[9:11]
         )
     
     
@@ -200,13 +243,22 @@ def compare_strings(cpf_string_a, cpf_string_b):
     
     Veja CPF.__eq__ para exemplos de situações verdadeiras e falsas.
     """
+    # Mesmo resultado que CPF(a) == CPF(b), sem criar os objetos e sem
+    # calcular digitos verificadores que já foram digitados.
+    digits_a = strip_symbols(cpf_string_a)
+    digits_b = strip_symbols(cpf_string_b)
     try:
-        cpf_a = CPF(cpf_string_a)
-        cpf_b = CPF(cpf_string_b)
+        require_format(digits_a, True)
+        require_format(digits_b, True)
     except InvalidIdFormat:
         return False
-    else:
-        return cpf_a == cpf_b
+    
+    if len(digits_a) == 9:
+        digits_a += calc_check_digit(digits_a)
+    if len(digits_b) == 9:
+        digits_b += calc_check_digit(digits_b)
+    
+    return digits_a == digits_b
 
 
 def is_valid(cpf_string, allow_missing_check_digits=False):
@@ -216,24 +268,89 @@ def is_valid(cpf_string, allow_missing_check_digits=False):
         allow_missing_check_digits - Verdadeiro se um número sem os dois 
                                      digitos verificadores for válido.
     """
-    try:
-        require_valid(cpf_string, allow_missing_check_digits)
-    except InvalidIdError:
+    # Mesmas regras de require_valid, sem o custo de emitir exceções. Não usa
+    # _fast: carregar Numba custaria centenas de milissegundos na primeira
+    # chamada, muito mais que validar um CPF.
+    cpf_digits = strip_symbols(cpf_string)
+    length = len(cpf_digits)
+    if length != 11 and not (length == 9 and allow_missing_check_digits):
         return False
-    else:
-        return True
+    
+    if not (cpf_digits.isascii() and cpf_digits.isdigit()):
+        return False
+    
+    valid, _ = _validate_digits(cpf_digits)
+    return valid
+
+
+def is_valid_batch(cpf_strings, allow_missing_check_digits=False):
+    """Retorna um numpy.ndarray de bool dizendo se cada CPF é válido.
+    
+    Mesmo que [is_valid(s) for s in cpf_strings]. Requer NumPy. Com Numba
+    instalado, todas as strings são concatenadas e validadas numa única
+    passada compilada. Sem Numba, somente o cálculo dos digitos
+    verificadores é feito de uma vez com NumPy.
+    
+    Args:
+        allow_missing_check_digits - Verdadeiro se um número sem os dois 
+                                     digitos verificadores for válido.
+    """
+    fast = _load_fast()
+    if fast.numpy is None:
+        raise ImportError('is_valid_batch requires NumPy')
+    
+    numpy = fast.numpy
+    if fast.HAS_NUMBA:
+        strings = list(cpf_strings)
+        joined = ''.join(strings)
+        if not joined.isascii():
+            # Espaços Unicode são removidos aqui. O que restar fora do ASCII
+            # vira '?' (um byte por caractére) e invalida a string.
+            strings = [s if s.isascii() else strip_symbols(s) for s in strings]
+            joined = ''.join(strings)
+        
+        buffer = numpy.frombuffer(
+            joined.encode('ascii', 'replace'), dtype=numpy.uint8
+        )
+        offsets = numpy.zeros(len(strings) + 1, dtype=numpy.intp)
+        numpy.cumsum([len(s) for s in strings], out=offsets[1:])
+        return fast.validate_joined(
+            buffer, offsets, allow_missing_check_digits
+        )
+    
+    digits = [strip_symbols(s) for s in cpf_strings]
+    result = numpy.zeros(len(digits), dtype=bool)
+    
+    lengths = (11, 9) if allow_missing_check_digits else (11,)
+    for length in lengths:
+        index = [
+            i for i, d in enumerate(digits)
+            if len(d) == length and d.isascii() and d.isdigit()
+        ]
+        if not index:
+            continue
+        
+        buffer = bytearray(''.join([digits[i] for i in index]), 'ascii')
+        rows = numpy.frombuffer(buffer, dtype=numpy.uint8)
+        result[index] = fast.validate_rows_u8(rows.reshape(-1, length))
+    
+    return result
 
 
 def require_valid(cpf_string, allow_missing_check_digits=False):
     """Emite exceções para diferentes problemas em um número de CPF.
     
+    O comprimento é verificado antes dos caractéres, então 'abc' resulta em
+    InvalidLength e não em InvalidCharacters. InvalidCharacters só ocorre
+    quando, sem pontos, espaços e traços, a string tem 11 (ou 9) caractéres.
+    
     Como usar:
         try:
             require_valid(valor_digitado_pelo_usuario)
-        except InvalidCharacters:
-            print('Favor digitar somente números, pontos e traços.')
         except InvalidLength:
             print('Favor digitar 11 digitos.')
+        except InvalidCharacters:
+            print('Favor digitar somente números, pontos e traços.')
         except InvalidCheckDigit:
             print('Você digitou o CPF incorretamente.')
         except InvalidSpecificId:
@@ -248,40 +365,70 @@ def require_valid(cpf_string, allow_missing_check_digits=False):
     """
     cpf_digits = strip_symbols(cpf_string)
     require_format(cpf_digits, allow_missing_check_digits)
-    if len(cpf_string) == 11:
-        if not has_correct_check_digit(cpf_digits):
-            raise InvalidCheckDigit("CPF check digit incorrect")
-        if is_specifically_invalid_number(cpf_digits):
-            raise InvalidCheckDigit("CPF number specifically invalid")
+    valid, _ = _validate_digits(cpf_digits)
+    if valid:
+        return
+    
+    if (len(cpf_digits) == 11
+            and calc_check_digit(cpf_digits) != cpf_digits[9:]):
+        raise InvalidCheckDigit("CPF check digit incorrect")
+    raise InvalidSpecificId("CPF number specifically invalid")
 
 
 def strip_symbols(cpf_string):
     """Remove espaços, pontos e traços de uma string."""
-    return re.sub(r'[\s.-]', '', cpf_string)
+    # bytes.translate é bem mais rápido que str.translate para strings ASCII,
+    # que são o caso comum.
+    try:
+        cpf_bytes = cpf_string.encode('ascii')
+    except UnicodeEncodeError:
+        return cpf_string.translate(_STRIP_TABLE)
+    
+    return cpf_bytes.translate(None, _STRIP_BYTES).decode('ascii')
+
+def strip_symbols_bytes(cpf_bytes):
+    """Mesmo que strip_symbols, para bytes. O resultado também é bytes."""
+    return cpf_bytes.translate(None, _STRIP_BYTES)
 
 def require_format(cpf_digits, allow_missing_check_digits=False):
-    """Emite exceções caso o formato do CPF esteja incorreto."""
-    if not cpf_digits.isdigit():
-        raise InvalidCharacters("CPF must contain digits only.")
+    """Emite exceções caso o formato do CPF esteja incorreto.
     
-    if len(cpf_digits) != 11:
+    InvalidLength tem prioridade sobre InvalidCharacters.
+    """
+    # O comprimento é verificado primeiro para não percorrer strings que
+    # já estão no tamanho errado.
+    length = len(cpf_digits)
+    if length != 11:
         if not allow_missing_check_digits:
             raise InvalidLength("CPF length must be 11 digits")
-        elif len(cpf_digits) != 9:
+        elif length != 9:
             raise InvalidLength("CPF length must be either 9 or 11 digits")
+    
+    # isascii() não percorre a string e descarta digitos de outros alfabetos,
+    # que isdigit() aceitaria.
+    if not (cpf_digits.isascii() and cpf_digits.isdigit()):
+        raise InvalidCharacters("CPF must contain digits only.")
 
 
 def calc_check_digit(cpf_digits):
     """Calcula os 2 digitos verificadores para validar um CPF."""
     # Caso a string tenha 11 digitos, use somente os primeiros 9
-    cpf_digits = cpf_digits[:9]
+    b = cpf_digits[:9].encode('ascii')
     
-    def multiply_digits(digits, weights):
-        for a, b in zip(digits, weights):
-            yield int(a) * b
+    # Soma dos digitos com pesos de 1 a 9. Os bytes são códigos ASCII, então
+    # 48 ('0') é descontado de cada digito de uma só vez no final.
+    weighted = (
+        b[0] + 2 * b[1] + 3 * b[2] + 4 * b[3] + 5 * b[4] +
+        6 * b[5] + 7 * b[6] + 8 * b[7] + 9 * b[8] - 45 * 48
+    )
+    plain = (
+        b[0] + b[1] + b[2] + b[3] + b[4] + b[5] + b[6] + b[7] + b[8] - 9 * 48
+    )
     
-    dv1 = (sum(multiply_digits(cpf_digits, range(1, 10))) % 11) % 10
-    dv2 = (sum(multiply_digits(cpf_digits + str(dv1), range(0, 10))) % 11) % 10
+    dv1 = (weighted % 11) % 10
+    # Pesos de 0 a 9 sobre os digitos seguidos de dv1: cada peso é um a menos
+    # que no primeiro cálculo, e dv1 entra com peso 9.
+    dv2 = ((weighted - plain + 9 * dv1) % 11) % 10
     
     return '%d%d' % (dv1, dv2)
 
@@ -301,5 +448,34 @@ def is_specifically_invalid_number(cpf_digits):
         DOCUMENTO DE ARRECADAÇÃO DE RECEITAS FEDERAIS, sub-item b1 de
         http://www3.tesouro.gov.br/spb/downloads/arquivos/protocolo_arrecadacao_DARF.pdf
     """
-    return all(cpf_digits[i] == cpf_digits[0] for i in range(1, 9))
-    
\ No newline at end of file
+    return cpf_digits[:9] in _INVALID_PREFIXES
+    
+
+@functools.lru_cache(maxsize=4096)
+def _validate_digits(cpf_digits):
+    """Retorna (válido, digitos com DV) para digitos já no formato correto.
+    
+    O resultado é guardado em cache, então validar o mesmo número várias
+    vezes custa apenas uma consulta. Erros de formato devem ser verificados
+    antes com require_format, fora do cache.
+    """
+    if len(cpf_digits) == 11:
+        # Números repetidos são rejeitados antes de calcular os digitos
+        # verificadores. calc_check_digit usa somente os 9 primeiros digitos.
+        valid = (
+            not is_specifically_invalid_number(cpf_digits)
+            and calc_check_digit(cpf_digits) == cpf_digits[9:]
+        )
+    else:
+        cpf_digits += calc_check_digit(cpf_digits)
+        valid = not is_specifically_invalid_number(cpf_digits)
+    
+    return valid, cpf_digits
+
+def _load_fast():
+    """Importa o módulo _fast na primeira chamada e o retorna."""
+    global _fast
+    if _fast is None:
+        from . import _fast as fast
+        _fast = fast
+    return _fast
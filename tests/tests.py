@@ -1,6 +1,8 @@
+import subprocess
+import sys
 import unittest
 
-from numeroscadastrais import cpf
+from numeroscadastrais import cpf, _fast
 from numeroscadastrais.exceptions import *
 
 cpf_string_1 = '111.111.111-11'
@@ -13,11 +15,39 @@ class TestCpf(unittest.TestCase):
         self.assertEqual(cpf.strip_symbols('123.456.789-10'), '12345678910')
         self.assertEqual(cpf.strip_symbols(' 123.456.789 10  '), '12345678910')
         self.assertEqual(cpf.strip_symbols('123/456.789-XX'), '123/456789XX')
+        self.assertEqual(cpf.strip_symbols('123.456-\u0661'), '123456\u0661')
+        self.assertEqual(cpf.strip_symbols('123.456.789\xa010'), '12345678910')
+        self.assertEqual(cpf.strip_symbols('123\u2003456\u3000789'),
+                         '123456789')
+        self.assertEqual(cpf.CPF('123.456.789\xa010').digits_only,
+                         '12345678910')
+        
+        self.assertEqual(cpf.strip_symbols_bytes(b'123.456.789-10'),
+                         b'12345678910')
+        self.assertEqual(cpf.strip_symbols_bytes(b'123\x1c456\x1f789'),
+                         b'123456789')
+        self.assertEqual(cpf.strip_symbols('123\x1c456\x1f789'), '123456789')
+    
+    def test_whitespace_table(self):
+        whitespace = ''.join(
+            c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace()
+        )
+        self.assertEqual(cpf._WHITESPACE, whitespace)
+        self.assertEqual(
+            cpf._STRIP_BYTES,
+            bytes(c for c in range(128) if chr(c).isspace()) + b'.-'
+        )
     
     def test_format(self):
         with self.assertRaises(InvalidCharacters):
             cpf.require_format('123456789XX')
         
+        with self.assertRaises(InvalidCharacters):
+            cpf.require_format('\u0661' * 11)
+        
+        with self.assertRaises(InvalidLength):
+            cpf.require_format('abc')
+        
         with self.assertRaises(InvalidLength):
             cpf.require_format('1234567891099')
         
@@ -35,6 +65,84 @@ class TestCpf(unittest.TestCase):
         self.assertEqual(cpf.calc_check_digit('280012389'), '38')
         self.assertEqual(cpf.calc_check_digit('111111111'), '11')
     
+    def test_fast_kernels(self):
+        def u8(digits):
+            if _fast.numpy is None:
+                return digits.encode('ascii')
+            return _fast.numpy.frombuffer(
+                bytearray(digits, 'ascii'), dtype=_fast.numpy.uint8
+            )
+        
+        calc = _fast._calc_check_digits_u8
+        self.assertEqual(calc(u8('100000987')), (4, 4))
+        self.assertEqual(calc(u8('28001238938')), (3, 8))
+        self.assertEqual(calc(u8('999999998')), (0, 8))
+        self.assertEqual(
+            getattr(calc, 'py_func', calc)(u8('999999998')), (0, 8)
+        )
+        self.assertTrue(_fast._is_specifically_invalid_u8(u8('22222222222')))
+        self.assertFalse(_fast._is_specifically_invalid_u8(u8('12312312312')))
+    
+    def test_validate_bytes(self):
+        cases = [
+            (b'100.000.987-44', False, 1),
+            (b' 100 000 987\t44\n', False, 1),
+            (b'100.000.987-45', False, 0),
+            (b'111.111.111-11', False, 0),
+            (b'100.000.987', False, -1),
+            (b'100.000.987', True, 1),
+            (b'111.111.111', True, 0),
+            (b'100.000.987-4X', False, -1),
+            (b'100.000.987-444', False, -1),
+            (b'', True, -1),
+            (b'100\x1c000\x1f987 44', False, 1),
+            (b'100.000.987', None, -1),
+            (b'100.000.987', 'yes', 1),
+        ]
+        for cpf_bytes, allow_missing, expected in cases:
+            self.assertEqual(
+                _fast.validate_bytes(cpf_bytes, allow_missing), expected
+            )
+    
+    @unittest.skipUnless(_fast.HAS_NUMBA, 'Numba not installed')
+    def test_fast_without_numba_cache(self):
+        # Simula uma instalação sem diretório gravável para o cache do Numba.
+        code = (
+            'import numba.core.caching as caching; '
+            'caching.CacheImpl._locator_classes = []; '
+            'import numeroscadastrais.cpf as cpf; '
+            'print(cpf.is_valid_batch(["100.000.987-44"]).tolist())'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(output.strip(), b'[True]')
+    
+    @unittest.skipIf(_fast.numpy is None, 'NumPy not installed')
+    def test_is_valid_batch(self):
+        strings = [
+            '100.000.987-44', '100.000.987-45', '111.111.111-11',
+            '280.012.389-38', 'abc', '100000987', '',
+        ]
+        self.assertEqual(
+            cpf.is_valid_batch(strings).tolist(),
+            [True, False, False, True, False, False, False]
+        )
+        self.assertEqual(
+            cpf.is_valid_batch(strings, True).tolist(),
+            [True, False, False, True, False, True, False]
+        )
+        self.assertEqual(cpf.is_valid_batch([]).tolist(), [])
+        self.assertEqual(
+            cpf.is_valid_batch(['100000987'], 'yes').tolist(), [True]
+        )
+        self.assertEqual(
+            cpf.is_valid_batch(['100000987'], None).tolist(), [False]
+        )
+        
+        strings = ['100.000.987\xa044', '100.000.987-\u0664\u0664',
+                   '280 012 389 38']
+        self.assertEqual(cpf.is_valid_batch(strings).tolist(),
+                         [True, False, True])
+    
     def test_has_correct_check_digit(self):
         self.assertTrue(cpf.has_correct_check_digit('11111111111'))
         self.assertFalse(cpf.has_correct_check_digit('11111111122'))
@@ -52,6 +160,45 @@ class TestCpf(unittest.TestCase):
         self.assertTrue(cpf.is_specifically_invalid_number('00000000000'))
         self.assertFalse(cpf.is_specifically_invalid_number('12312312312'))
     
+    def test_require_valid(self):
+        cpf.require_valid('100.000.987-44')
+        cpf.require_valid('100000987', True)
+        
+        with self.assertRaises(InvalidCheckDigit):
+            cpf.require_valid('100.000.987-45')
+        
+        with self.assertRaises(InvalidCheckDigit):
+            cpf.require_valid('111.111.111-22')
+        
+        with self.assertRaises(InvalidSpecificId):
+            cpf.require_valid('111.111.111-11')
+        
+        with self.assertRaises(InvalidSpecificId):
+            cpf.require_valid('111.111.111', True)
+        
+    def test_is_valid(self):
+        self.assertTrue(cpf.is_valid('100.000.987-44'))
+        self.assertTrue(cpf.is_valid('100.000.987', True))
+        self.assertFalse(cpf.is_valid('100.000.987'))
+        self.assertFalse(cpf.is_valid('100.000.987-45'))
+        self.assertFalse(cpf.is_valid('111.111.111-11'))
+        self.assertFalse(cpf.is_valid('111.111.111', True))
+        self.assertFalse(cpf.is_valid('100.000.987-4X'))
+        self.assertFalse(cpf.is_valid('1000009874'))
+        self.assertTrue(cpf.is_valid('100.000.987\xa044'))
+        self.assertTrue(cpf.is_valid('100.000.987\x1c44'))
+        self.assertIs(cpf.is_valid('100.000.987', None), False)
+        self.assertIs(cpf.is_valid('100.000.987', 'yes'), True)
+    
+    def test_lazy_fast_import(self):
+        code = (
+            'import sys, numeroscadastrais.cpf as cpf; '
+            'cpf.is_valid("100.000.987-44"); '
+            'print("numeroscadastrais._fast" in sys.modules)'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(output.strip(), b'False')
+    
     def test_eq(self):
         cpf_1 = cpf.CPF(cpf_string_1)
         cpf_1_2 = cpf.CPF(cpf_string_1_2)
@@ -72,6 +219,43 @@ class TestCpf(unittest.TestCase):
         self.assertFalse(cpf.compare_strings(cpf_string_2, 'abcd'))
         self.assertFalse(cpf.compare_strings(cpf_string_2, '1234567'))
         self.assertFalse(cpf.compare_strings('abcd', '1234567'))
+        self.assertTrue(cpf.compare_strings('111.111.111', cpf_string_1))
+        self.assertFalse(cpf.compare_strings('123.456.789', cpf_string_2))
+    
+    def test_str(self):
+        cpf_2 = cpf.CPF('12345678910')
+        self.assertEqual(str(cpf_2), '123.456.789-10')
+        self.assertEqual(repr(cpf_2), "CPF('123.456.789-10')")
+        self.assertEqual(str(cpf.CPF('100000987')), '100.000.987-44')
+    
+    def test_components(self):
+        cpf_2 = cpf.CPF(cpf_string_2)
+        self.assertEqual(cpf_2.digitos_aleatorios, '12345678')
+        self.assertEqual(cpf_2.digito_regiao_fiscal, '9')
+        self.assertEqual(cpf_2.digitos_verificadores, '10')
+        self.assertEqual(cpf_2.regiao_fiscal, 9)
+        self.assertEqual(cpf.CPF('100000900').regiao_fiscal, 10)
+    
+    def test_intern(self):
+        cpf_1 = cpf.CPF.intern(cpf_string_1)
+        self.assertIs(cpf.CPF.intern(cpf_string_1_2), cpf_1)
+        self.assertIs(cpf.CPF.intern('111.111.111'), cpf_1)
+        self.assertIsNot(cpf.CPF(cpf_string_1), cpf_1)
+        self.assertEqual(cpf.CPF(cpf_string_1), cpf_1)
+        
+        with self.assertRaises(InvalidLength):
+            cpf.CPF.intern('1234567')
+        
+        class SubCPF(cpf.CPF):
+            __slots__ = ()
+        
+        sub_1 = SubCPF.intern(cpf_string_1)
+        self.assertIs(type(sub_1), SubCPF)
+        self.assertIs(SubCPF.intern(cpf_string_1_2), sub_1)
+        self.assertIs(cpf.CPF.intern(cpf_string_1), cpf_1)
+        self.assertEqual(str(sub_1), cpf_string_1)
+        self.assertEqual(sub_1.regiao_fiscal, 1)
+        self.assertFalse(sub_1.is_valid)
     
     def test_hash(self):
         d = {}